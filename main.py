@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, date
+from collections.abc import Callable
+from datetime import datetime
+import functools
 import importlib
+import importlib.util
 import os
+import sys
+import time
 import zoneinfo
 
 from astrbot.api import logger
@@ -21,29 +26,51 @@ LUNAR_CALENDAR_AVAILABLE = False
 
 
 def _load_calendar_dependencies() -> None:
-    global calendar_cn, Converter, Solar
+    """检查可选依赖是否已安装，实际导入推迟到首次使用时"""
     global CHINESE_CALENDAR_AVAILABLE, LUNAR_CALENDAR_AVAILABLE
 
-    try:
-        calendar_cn = importlib.import_module("chinese_calendar")
-        CHINESE_CALENDAR_AVAILABLE = True
-    except ImportError:
-        calendar_cn = None
-        CHINESE_CALENDAR_AVAILABLE = False
+    # 后台安装依赖后重新检查时，需要刷新导入系统的路径缓存
+    importlib.invalidate_caches()
 
-    try:
-        lunarcalendar = importlib.import_module("lunarcalendar")
-        Converter = lunarcalendar.Converter
-        Solar = lunarcalendar.Solar
-        LUNAR_CALENDAR_AVAILABLE = True
-    except ImportError:
-        Converter = None
-        Solar = None
-        LUNAR_CALENDAR_AVAILABLE = False
+    CHINESE_CALENDAR_AVAILABLE = (
+        calendar_cn is not None
+        or importlib.util.find_spec("chinese_calendar") is not None
+    )
+    LUNAR_CALENDAR_AVAILABLE = (
+        Converter is not None or importlib.util.find_spec("lunarcalendar") is not None
+    )
+
+
+def _ensure_chinese_calendar() -> bool:
+    """首次使用时导入 chinese_calendar，返回是否可用"""
+    global calendar_cn, CHINESE_CALENDAR_AVAILABLE
+
+    if calendar_cn is None and CHINESE_CALENDAR_AVAILABLE:
+        try:
+            calendar_cn = importlib.import_module("chinese_calendar")
+        except ImportError:
+            CHINESE_CALENDAR_AVAILABLE = False
+    return calendar_cn is not None
+
+
+def _ensure_lunar_calendar() -> bool:
+    """首次使用时导入 lunarcalendar，返回是否可用"""
+    global Converter, Solar, LUNAR_CALENDAR_AVAILABLE
+
+    if Converter is None and LUNAR_CALENDAR_AVAILABLE:
+        try:
+            lunarcalendar = importlib.import_module("lunarcalendar")
+            Converter = lunarcalendar.Converter
+            Solar = lunarcalendar.Solar
+        except ImportError:
+            Converter = None
+            Solar = None
+            LUNAR_CALENDAR_AVAILABLE = False
+    return Converter is not None
 
 
 # 农历月份和日期的中文表示
-LUNAR_MONTHS = [
+LUNAR_MONTHS = (
     "正月",
     "二月",
     "三月",
@@ -56,8 +83,8 @@ LUNAR_MONTHS = [
     "十月",
     "冬月",
     "腊月",
-]
-LUNAR_DAYS = [
+)
+LUNAR_DAYS = (
     "初一",
     "初二",
     "初三",
@@ -88,10 +115,10 @@ LUNAR_DAYS = [
     "廿八",
     "廿九",
     "三十",
-]
+)
 
 # 二十四节气
-SOLAR_TERMS = [
+SOLAR_TERMS = (
     "小寒",
     "大寒",
     "立春",
@@ -116,15 +143,38 @@ SOLAR_TERMS = [
     "小雪",
     "大雪",
     "冬至",
-]
+)
+
+# 每月两个节气的日期（简化版，基于平均值），按 月份 - 1 索引
+# 对应 SOLAR_TERMS[(月份 - 1) * 2] 与 SOLAR_TERMS[(月份 - 1) * 2 + 1]
+SOLAR_TERM_BY_MONTH = (
+    (6, 20),  # 小寒、大寒
+    (4, 19),  # 立春、雨水
+    (6, 21),  # 惊蛰、春分
+    (5, 20),  # 清明、谷雨
+    (6, 21),  # 立夏、小满
+    (6, 21),  # 芒种、夏至
+    (7, 23),  # 小暑、大暑
+    (7, 23),  # 立秋、处暑
+    (8, 23),  # 白露、秋分
+    (8, 23),  # 寒露、霜降
+    (7, 22),  # 立冬、小雪
+    (7, 22),  # 大雪、冬至
+)
 
 # 天干地支
-TIAN_GAN = ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
-DI_ZHI = ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]
-SHENG_XIAO = ["鼠", "牛", "虎", "兔", "龙", "蛇", "马", "羊", "猴", "鸡", "狗", "猪"]
+TIAN_GAN = ("甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸")
+DI_ZHI = ("子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥")
+SHENG_XIAO = ("鼠", "牛", "虎", "兔", "龙", "蛇", "马", "羊", "猴", "鸡", "狗", "猪")
+
+# 六十甲子年份前缀，按 (农历年 - 4) % 60 索引，如 "农历甲辰年(龙年)"
+LUNAR_YEAR_PREFIXES = tuple(
+    f"农历{TIAN_GAN[i % 10]}{DI_ZHI[i % 12]}年({SHENG_XIAO[i % 12]}年)"
+    for i in range(60)
+)
 
 # 黄历宜忌（简化版，基于日期的简单算法）
-YI_ITEMS = [
+YI_ITEMS = (
     "祭祀",
     "祈福",
     "求嗣",
@@ -149,8 +199,8 @@ YI_ITEMS = [
     "成服",
     "修造",
     "竖柱",
-]
-JI_ITEMS = [
+)
+JI_ITEMS = (
     "嫁娶",
     "开市",
     "安葬",
@@ -167,11 +217,21 @@ JI_ITEMS = [
     "纳采",
     "订盟",
     "造庙",
-]
+)
 
 
 # 常量定义
-WEEKDAY_NAMES = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
+WEEKDAY_NAMES = ("周一", "周二", "周三", "周四", "周五", "周六", "周日")
+
+# 时间段，按小时(0-23)索引
+TIME_PERIOD_BY_HOUR = (
+    ("深夜",) * 5  # 0-4
+    + ("上午",) * 7  # 5-11
+    + ("中午",) * 2  # 12-13
+    + ("下午",) * 4  # 14-17
+    + ("晚上",) * 4  # 18-21
+    + ("深夜",) * 2  # 22-23
+)
 
 PLATFORM_DISPLAY_NAMES = {
     "aiocqhttp": "QQ",
@@ -185,6 +245,60 @@ PLATFORM_DISPLAY_NAMES = {
 }
 
 
+# 群名称占位符（小写），长度均不超过 _PLACEHOLDER_MAX_LEN
+_PLACEHOLDERS_CF = frozenset({"n/a", "none", "null", "unknown"})
+_PLACEHOLDER_MAX_LEN = 7
+
+# 消息段类型常量
+_IMG, _VOICE, _AUDIO, _VIDEO = map(sys.intern, ("image", "voice", "audio", "video"))
+
+
+# 事件类 -> get_message_type 方法（不存在时为 None）
+_MTYPE_GETTER_CACHE: dict[type, Callable | None] = {}
+
+
+def _mtype_getter(cls: type) -> Callable | None:
+    """按事件类缓存 get_message_type 的查找结果"""
+    try:
+        return _MTYPE_GETTER_CACHE[cls]
+    except KeyError:
+        return _MTYPE_GETTER_CACHE.setdefault(
+            cls, getattr(cls, "get_message_type", None)
+        )
+
+
+@functools.lru_cache(maxsize=4096)
+def _almanac_for_day(day_hash: int) -> str:
+    """根据日期哈希生成黄历宜忌字符串，结果只与日期有关"""
+    # 根据日期哈希选择宜忌项目
+    yi_count = (day_hash % 4) + 2  # 2-5个宜
+    ji_count = (day_hash % 3) + 2  # 2-4个忌
+
+    # 使用日期作为种子选择具体项目
+    yi_start = day_hash % len(YI_ITEMS)
+    ji_start = (day_hash * 7) % len(JI_ITEMS)
+
+    yi_list = []
+    ji_list = []
+
+    for i in range(yi_count):
+        yi_list.append(YI_ITEMS[(yi_start + i * 3) % len(YI_ITEMS)])
+
+    for i in range(ji_count):
+        ji_list.append(JI_ITEMS[(ji_start + i * 5) % len(JI_ITEMS)])
+
+    yi_str = "、".join(yi_list)
+    ji_str = "、".join(ji_list)
+
+    return f"宜: {yi_str} | 忌: {ji_str}"
+
+
+@functools.lru_cache(maxsize=32)
+def _platform_prefix(platform_name: str) -> str:
+    """返回拼接好的平台信息字符串，如 "平台: QQ"，按平台名缓存"""
+    return f"平台: {PLATFORM_DISPLAY_NAMES.get(platform_name, platform_name)}"
+
+
 @register("add_time", "miaomiao", "让每次请求都携带这次请求的时间", "1.1.0")
 class MyPlugin(Star):
     def __init__(self, context: Context, config: AstrBotConfig):
@@ -199,6 +313,11 @@ class MyPlugin(Star):
         self.enable_almanac = config.get("enable_almanac_perception", False)
         self.holiday_country = config.get("holiday_country", "CN")
 
+        # 按日缓存的日期感知信息，键为 current_time.toordinal()，仅保留当天一条
+        self._day_cache: dict[int, tuple[str, str, str, str]] = {}
+        # 最近一次的 (整秒时间戳, 当前时间, 格式化时间字符串)
+        self._time_cache: tuple[int, datetime | None, str] = (0, None, "")
+
         # 初始化时区
         try:
             self.timezone = zoneinfo.ZoneInfo(timezone_name)
@@ -210,6 +329,7 @@ class MyPlugin(Star):
             timezone_name = "Asia/Shanghai"
 
         _load_calendar_dependencies()
+        self._update_time_ctx_flag()
         self._dependency_check_task = None
         if not CHINESE_CALENDAR_AVAILABLE or not LUNAR_CALENDAR_AVAILABLE:
             self._schedule_optional_dependency_check(context)
@@ -259,8 +379,20 @@ class MyPlugin(Star):
             )
 
         _load_calendar_dependencies()
+        # 依赖可用性可能已变化，丢弃基于旧状态生成的缓存
+        self._day_cache = {}
+        self._update_time_ctx_flag()
         self._log_optional_dependency_status()
 
+    def _update_time_ctx_flag(self) -> None:
+        """根据配置与依赖状态判断是否需要计算日期相关信息"""
+        self._need_time_ctx = (
+            self.enable_holiday
+            or (self.enable_lunar and LUNAR_CALENDAR_AVAILABLE)
+            or self.enable_solar_term
+            or self.enable_almanac
+        )
+
     @staticmethod
     def _log_optional_dependency_status() -> None:
         calendar_status = "已启用" if CHINESE_CALENDAR_AVAILABLE else "不可用"
@@ -272,7 +404,7 @@ class MyPlugin(Star):
         )
 
     def _get_holiday_info(self, current_time: datetime) -> str:
-        """获取节假日信息"""
+        """获取节假日信息（仅与日期有关，不含时间段）"""
         if not self.enable_holiday:
             return ""
 
@@ -283,27 +415,17 @@ class MyPlugin(Star):
         info_parts.append(WEEKDAY_NAMES[weekday])
 
         # 使用 chinese-calendar 库进行节假日判断（仅支持中国）
-        if (
-            self.holiday_country == "CN"
-            and CHINESE_CALENDAR_AVAILABLE
-            and calendar_cn is not None
-        ):
-            current_date = date(current_time.year, current_time.month, current_time.day)
+        if self.holiday_country == "CN" and _ensure_chinese_calendar():
+            current_date = current_time.date()
 
-            # 判断是否为法定节假日
-            is_holiday = calendar_cn.is_holiday(current_date)
-            # 判断是否为工作日（考虑调休）
-            is_workday = calendar_cn.is_workday(current_date)
+            # 判断是否为法定节假日并获取节日名称
+            # get_holiday_detail 返回 (is_on_holiday, holiday_name) 元组
+            is_holiday, holiday_name = calendar_cn.get_holiday_detail(current_date)
+            # 判断是否为工作日（考虑调休），节假日必然不是工作日
+            is_workday = not is_holiday and calendar_cn.is_workday(current_date)
 
             if is_holiday:
-                # 获取节日名称
-                # get_holiday_detail 返回 (is_on_holiday, holiday_name) 元组
-                holiday_detail = calendar_cn.get_holiday_detail(current_date)
-                holiday_name = (
-                    holiday_detail[1]
-                    if holiday_detail and holiday_detail[1]
-                    else "法定节假日"
-                )
+                holiday_name = holiday_name or "法定节假日"
 
                 # 区分周末和工作日的法定节假日
                 if weekday >= 5:
@@ -324,31 +446,36 @@ class MyPlugin(Star):
             else:
                 info_parts.append("工作日")
 
-        # 判断时间段
-        hour = current_time.hour
-        if 5 <= hour < 12:
-            time_period = "上午"
-        elif 12 <= hour < 14:
-            time_period = "中午"
-        elif 14 <= hour < 18:
-            time_period = "下午"
-        elif 18 <= hour < 22:
-            time_period = "晚上"
-        else:
-            time_period = "深夜"
-        info_parts.append(time_period)
-
         safe_parts = [str(part) for part in info_parts if part]
         return ", ".join(safe_parts)
 
+    def _get_time_period_info(self, current_time: datetime) -> str:
+        """获取时间段信息（随小时变化，不参与按日缓存）"""
+        if not self.enable_holiday:
+            return ""
+
+        return TIME_PERIOD_BY_HOUR[current_time.hour]
+
+    def _get_day_info(self, current_time: datetime) -> tuple[str, str, str, str]:
+        """获取按日缓存的 (节假日, 农历, 节气, 黄历) 信息"""
+        ord_day = current_time.toordinal()
+        cached = self._day_cache.get(ord_day)
+        if cached is not None:
+            return cached
+
+        day_info = (
+            self._get_holiday_info(current_time),
+            self._get_lunar_info(current_time),
+            self._get_solar_term_info(current_time),
+            self._get_almanac_info(current_time),
+        )
+        # 日期变化时直接替换，旧日期的条目随之淘汰
+        self._day_cache = {ord_day: day_info}
+        return day_info
+
     def _get_lunar_info(self, current_time: datetime) -> str:
         """获取农历日期信息"""
-        if (
-            not self.enable_lunar
-            or not LUNAR_CALENDAR_AVAILABLE
-            or Solar is None
-            or Converter is None
-        ):
+        if not self.enable_lunar or not _ensure_lunar_calendar():
             return ""
 
         try:
@@ -363,12 +490,10 @@ class MyPlugin(Star):
             if lunar.isleap:
                 month_str = "闰" + month_str
 
-            # 计算天干地支年份
-            year_gan = TIAN_GAN[(lunar.year - 4) % 10]
-            year_zhi = DI_ZHI[(lunar.year - 4) % 12]
-            sheng_xiao = SHENG_XIAO[(lunar.year - 4) % 12]
+            # 天干地支年份与生肖直接查表
+            year_prefix = LUNAR_YEAR_PREFIXES[(lunar.year - 4) % 60]
 
-            return f"农历{year_gan}{year_zhi}年({sheng_xiao}年){month_str}{day_str}"
+            return f"{year_prefix}{month_str}{day_str}"
         except Exception as e:
             logger.debug(f"获取农历信息失败: {e}")
             return ""
@@ -379,70 +504,35 @@ class MyPlugin(Star):
             return ""
 
         try:
-            # 节气日期表（简化版，基于平均值）
-            # 每个节气大约相隔15天，从小寒开始
-            solar_term_dates = [
-                (1, 6),
-                (1, 20),  # 小寒、大寒
-                (2, 4),
-                (2, 19),  # 立春、雨水
-                (3, 6),
-                (3, 21),  # 惊蛰、春分
-                (4, 5),
-                (4, 20),  # 清明、谷雨
-                (5, 6),
-                (5, 21),  # 立夏、小满
-                (6, 6),
-                (6, 21),  # 芒种、夏至
-                (7, 7),
-                (7, 23),  # 小暑、大暑
-                (8, 7),
-                (8, 23),  # 立秋、处暑
-                (9, 8),
-                (9, 23),  # 白露、秋分
-                (10, 8),
-                (10, 23),  # 寒露、霜降
-                (11, 7),
-                (11, 22),  # 立冬、小雪
-                (12, 7),
-                (12, 22),  # 大雪、冬至
-            ]
-
             current_month = current_time.month
             current_day = current_time.day
 
-            # 查找当前日期对应的节气（前后3天内）
-            for i, (month, day) in enumerate(solar_term_dates):
-                if current_month == month and abs(current_day - day) <= 2:
-                    if current_day == day:
-                        return f"今日{SOLAR_TERMS[i]}"
-                    elif current_day < day:
-                        return f"临近{SOLAR_TERMS[i]}"
-                    else:
-                        return f"{SOLAR_TERMS[i]}已过"
-
-            # 查找当前处于哪两个节气之间
-            for i, (month, day) in enumerate(solar_term_dates):
-                next_i = (i + 1) % 24
-                next_month, next_day = solar_term_dates[next_i]
-
-                # 判断当前日期是否在这两个节气之间
-                current_ordinal = current_month * 100 + current_day
-                this_ordinal = month * 100 + day
-                next_ordinal = next_month * 100 + next_day
-
-                # 处理跨年的情况
-                if next_ordinal < this_ordinal:  # 跨年
-                    if (
-                        current_ordinal >= this_ordinal
-                        or current_ordinal < next_ordinal
-                    ):
-                        return f"当前节气: {SOLAR_TERMS[i]}"
-                else:
-                    if this_ordinal <= current_ordinal < next_ordinal:
-                        return f"当前节气: {SOLAR_TERMS[i]}"
+            # 直接按月份取出当月两个节气，判断是否在前后2天内
+            d1, d2 = SOLAR_TERM_BY_MONTH[current_month - 1]
+            i_base = (current_month - 1) * 2
+            delta1 = current_day - d1
+            delta2 = current_day - d2
+
+            # 临近当月两个节气（前后2天内）
+            if -2 <= delta1 <= 2:
+                term, delta = SOLAR_TERMS[i_base], delta1
+            elif -2 <= delta2 <= 2:
+                term, delta = SOLAR_TERMS[i_base + 1], delta2
+            # 否则判断当前处于哪两个节气之间
+            elif delta1 < -2:
+                # 上月第二个节气，1月时回绕到冬至
+                return f"当前节气: {SOLAR_TERMS[i_base - 1]}"
+            elif delta2 > 2:
+                return f"当前节气: {SOLAR_TERMS[i_base + 1]}"
+            else:
+                return f"当前节气: {SOLAR_TERMS[i_base]}"
 
-            return ""
+            if delta == 0:
+                return f"今日{term}"
+            elif delta < 0:
+                return f"临近{term}"
+            else:
+                return f"{term}已过"
         except Exception as e:
             logger.debug(f"获取节气信息失败: {e}")
             return ""
@@ -457,28 +547,7 @@ class MyPlugin(Star):
             day_hash = (
                 current_time.year * 10000 + current_time.month * 100 + current_time.day
             )
-
-            # 根据日期哈希选择宜忌项目
-            yi_count = (day_hash % 4) + 2  # 2-5个宜
-            ji_count = (day_hash % 3) + 2  # 2-4个忌
-
-            # 使用日期作为种子选择具体项目
-            yi_start = day_hash % len(YI_ITEMS)
-            ji_start = (day_hash * 7) % len(JI_ITEMS)
-
-            yi_list = []
-            ji_list = []
-
-            for i in range(yi_count):
-                yi_list.append(YI_ITEMS[(yi_start + i * 3) % len(YI_ITEMS)])
-
-            for i in range(ji_count):
-                ji_list.append(JI_ITEMS[(ji_start + i * 5) % len(JI_ITEMS)])
-
-            yi_str = "、".join(yi_list)
-            ji_str = "、".join(ji_list)
-
-            return f"宜: {yi_str} | 忌: {ji_str}"
+            return _almanac_for_day(day_hash)
         except Exception as e:
             logger.debug(f"获取黄历信息失败: {e}")
             return ""
@@ -487,66 +556,81 @@ class MyPlugin(Star):
     def _clean_group_name(name: str | None) -> str | None:
         if not name:
             return None
-        candidate = str(name).strip()
+        candidate = name.strip() if isinstance(name, str) else str(name).strip()
         if not candidate:
             return None
-        placeholders = {"N/A", "NONE", "NULL", "UNKNOWN"}
-        if candidate.upper() in placeholders:
+        # 只有短字符串才可能是占位符，避免为普通群名分配新字符串
+        if (
+            len(candidate) <= _PLACEHOLDER_MAX_LEN
+            and candidate.casefold() in _PLACEHOLDERS_CF
+        ):
             return None
         return candidate
 
-    async def _get_group_name(self, event: AstrMessageEvent) -> str | None:
-        """优先从消息对象中读取群名称，否则调用协议端接口获取"""
-        message_obj = getattr(event, "message_obj", None)
+    def _get_local_group_name(self, message_obj) -> str | None:
+        """从消息对象中读取群名称，无需调用协议端接口"""
         group_obj = getattr(message_obj, "group", None) if message_obj else None
         if group_obj:
-            group_name = self._clean_group_name(getattr(group_obj, "group_name", None))
-            if group_name:
-                return group_name
+            return self._clean_group_name(getattr(group_obj, "group_name", None))
+        return None
 
+    def _get_group_lookup_id(self, event: AstrMessageEvent) -> str:
+        """返回需要通过协议端接口查询群名称的群号，无法查询时返回空字符串"""
         get_group_fn = getattr(event, "get_group", None)
         if not callable(get_group_fn):
-            return None
-
-        group_id = ""
-        if hasattr(event, "get_group_id"):
-            group_id = event.get_group_id()
-        elif message_obj:
-            group_id = getattr(message_obj, "group_id", "")
-
-        if not group_id:
-            return None
+            return ""
+        return self._get_group_id(event) or ""
 
+    @staticmethod
+    def _get_group_id(event: AstrMessageEvent) -> str:
+        """获取群号，优先使用 AstrMessageEvent 提供的接口"""
+        get_group_id = getattr(event, "get_group_id", None)
+        if get_group_id:
+            return get_group_id()
+        message_obj = getattr(event, "message_obj", None)
+        if message_obj:
+            return getattr(message_obj, "group_id", "")
+        return ""
+
+    async def _fetch_group_name(
+        self, event: AstrMessageEvent, group_id: str
+    ) -> str | None:
+        """调用协议端接口获取群名称"""
         try:
-            group_info = await get_group_fn(group_id=group_id)
+            group_info = await event.get_group(group_id=group_id)
         except Exception as exc:
             logger.debug(f"LLMPerception: 获取群聊信息失败: {exc}")
             return None
 
         if group_info:
-            group_name = self._clean_group_name(getattr(group_info, "group_name", None))
-            if group_name:
-                return group_name
+            return self._clean_group_name(getattr(group_info, "group_name", None))
         return None
 
-    async def _get_platform_info(self, event: AstrMessageEvent) -> str:
-        """获取平台环境信息"""
+    def _get_platform_info_sync(
+        self, event: AstrMessageEvent
+    ) -> tuple[list[str], str, int]:
+        """同步获取平台环境信息
+
+        返回 (信息列表, 待查询群号, 群名插入位置)。群名称无法从消息对象中
+        读取时，待查询群号非空，需由调用方通过 _fetch_group_name 获取后
+        插入到信息列表的指定位置。
+        """
         if not self.enable_platform:
-            return ""
+            return [], "", 0
 
         info_parts = []
 
         # 平台类型
-        platform_name = event.get_platform_name()
-        platform_display = PLATFORM_DISPLAY_NAMES.get(platform_name, platform_name)
-        info_parts.append(f"平台: {platform_display}")
+        info_parts.append(_platform_prefix(event.get_platform_name()))
 
         # 判断是群聊还是私聊，优先使用 AstrMessageEvent 提供的接口
         message_type = None
-        if hasattr(event, "get_message_type"):
-            message_type = event.get_message_type()
-        elif getattr(event, "message_obj", None):
-            message_type = event.message_obj.type
+        message_obj = getattr(event, "message_obj", None)
+        getter = _mtype_getter(type(event))
+        if getter is not None:
+            message_type = getter(event)
+        elif message_obj:
+            message_type = message_obj.type
 
         is_group_chat = False
         if message_type == MessageType.GROUP_MESSAGE:
@@ -554,29 +638,35 @@ class MyPlugin(Star):
             is_group_chat = True
         elif message_type == MessageType.FRIEND_MESSAGE:
             info_parts.append("私聊")
-        else:
-            group_id = ""
-            if hasattr(event, "get_group_id"):
-                group_id = event.get_group_id()
-            elif getattr(event, "message_obj", None):
-                group_id = getattr(event.message_obj, "group_id", "")
-            if group_id:
-                info_parts.append("群聊")
-                is_group_chat = True
+        elif self._get_group_id(event):
+            info_parts.append("群聊")
+            is_group_chat = True
 
+        pending_group_id = ""
+        group_name_slot = 0
         if is_group_chat:
-            group_name = await self._get_group_name(event)
+            group_name = self._get_local_group_name(message_obj)
             if group_name:
                 info_parts.append(f"群名: {group_name}")
+            else:
+                pending_group_id = self._get_group_lookup_id(event)
+                group_name_slot = len(info_parts)
 
         # 消息类型
-        message_chain = event.message_obj
-        if message_chain and hasattr(message_chain, "message"):
-            has_image = any(seg.type == "image" for seg in message_chain.message)
-            has_audio = any(
-                seg.type in ["voice", "audio"] for seg in message_chain.message
-            )
-            has_video = any(seg.type == "video" for seg in message_chain.message)
+        segments = getattr(message_obj, "message", None) if message_obj else None
+        if segments is not None:
+            # 单次遍历消息链，三类媒体都出现后提前结束
+            has_image = has_audio = has_video = False
+            for seg in segments:
+                seg_type = seg.type
+                if seg_type == _IMG:
+                    has_image = True
+                elif seg_type == _VOICE or seg_type == _AUDIO:
+                    has_audio = True
+                elif seg_type == _VIDEO:
+                    has_video = True
+                if has_image and has_audio and has_video:
+                    break
 
             if has_image:
                 info_parts.append("含图片")
@@ -585,46 +675,50 @@ class MyPlugin(Star):
             if has_video:
                 info_parts.append("含视频")
 
-        return ", ".join(info_parts)
+        return info_parts, pending_group_id, group_name_slot
 
     @filter.on_llm_request()
     async def my_custom_hook_1(self, event: AstrMessageEvent, req: ProviderRequest):
-        # 获取当前时间（使用配置的时区）
-        current_time = datetime.now(self.timezone)
-
-        # 基础时间信息
-        timestr = current_time.strftime("%Y-%m-%d %H:%M:%S")
-
-        # 构建感知信息
-        perception_parts = [f"发送时间: {timestr}"]
-
-        # 添加节假日信息
-        holiday_info = self._get_holiday_info(current_time)
-        if holiday_info:
-            perception_parts.append(holiday_info)
-
-        # 添加农历信息
-        lunar_info = self._get_lunar_info(current_time)
-        if lunar_info:
-            perception_parts.append(lunar_info)
-
-        # 添加节气信息
-        solar_term_info = self._get_solar_term_info(current_time)
-        if solar_term_info:
-            perception_parts.append(solar_term_info)
-
-        # 添加黄历信息
-        almanac_info = self._get_almanac_info(current_time)
-        if almanac_info:
-            perception_parts.append(almanac_info)
-
-        # 添加平台信息
-        platform_info = await self._get_platform_info(event)
-        if platform_info:
-            perception_parts.append(platform_info)
-
-        # 组合所有感知信息
-        perception_text = " | ".join(perception_parts)
+        # 获取当前时间（使用配置的时区），同一秒内复用上次的结果
+        sec = int(time.time())
+        cached_sec, current_time, timestr = self._time_cache
+        if sec != cached_sec or current_time is None:
+            current_time = datetime.fromtimestamp(sec, self.timezone)
+            timestr = current_time.strftime("%Y-%m-%d %H:%M:%S")
+            self._time_cache = (sec, current_time, timestr)
+
+        # 日期相关信息每天只计算一次，全部关闭时直接跳过
+        if self._need_time_ctx:
+            holiday_info, lunar_info, solar_term_info, almanac_info = (
+                self._get_day_info(current_time)
+            )
+
+            # 时间段按小时变化，在缓存之外拼接到节假日信息后
+            if holiday_info:
+                time_period = self._get_time_period_info(current_time)
+                holiday_info = f"{holiday_info}, {time_period}"
+        else:
+            holiday_info = lunar_info = solar_term_info = almanac_info = ""
+
+        # 平台信息同步收集，仅在需要查询群名称时才等待协议端
+        platform_parts, pending_group_id, group_name_slot = (
+            self._get_platform_info_sync(event)
+        )
+        if pending_group_id:
+            group_name = await self._fetch_group_name(event, pending_group_id)
+            if group_name:
+                platform_parts.insert(group_name_slot, f"群名: {group_name}")
+
+        # 构建感知信息，空项在拼接时跳过
+        perception_parts = [
+            f"发送时间: {timestr}",
+            holiday_info,
+            lunar_info,
+            solar_term_info,
+            almanac_info,
+            ", ".join(platform_parts),
+        ]
+        perception_text = " | ".join(part for part in perception_parts if part)
 
         # 在用户消息前添加感知信息
         req.prompt = f"[{perception_text}]\n{req.prompt}"